@@ -3,10 +3,13 @@ Main Module for Smart Water Pressure Management System
 Core functionality and data processing
 """
 
+import functools
 import os
 import sys
 import pandas as pd
+import numpy as np
 import json
+import orjson
 from datetime import datetime
 
 # Add utils to path
@@ -17,23 +20,46 @@ from utils.analytics import WaterAnalytics
 from utils.anomaly_detection import AnomalyDetector
 
 
+@functools.lru_cache(maxsize=8)
+def _load_zones_config(path, mtime):
+    """Parse the zones config once per on-disk version"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
 class SmartWaterManagementSystem:
     """Main system class for water pressure management"""
     
-    def __init__(self, data_dir='data'):
-        """Initialize the system"""
+    def __init__(self, data_dir='data', backend='pandas'):
+        """Initialize the system
+
+        Args:
+            data_dir: Directory containing the data files
+            backend: 'pandas' (default) or 'polars' for lazy-frame analytics
+        """
         self.data_dir = data_dir
+        self.backend = backend
         self.zones_config_path = os.path.join(data_dir, 'zones_config.json')
         self.pressure_data_path = os.path.join(data_dir, 'pressure_data.csv')
         self.flow_data_path = os.path.join(data_dir, 'flow_data.csv')
         
-        # Load zones configuration
-        with open(self.zones_config_path, 'r') as f:
-            self.zones_config = json.load(f)
-        
+        # Load zones configuration (cached across instances)
+        self.zones_config = _load_zones_config(
+            self.zones_config_path, os.path.getmtime(self.zones_config_path)
+        )
+
+        # Precompute config aggregates once; the overview is requested on
+        # every page view
+        self._zones = self.zones_config['zones']
+        self._total_population = sum(z['population'] for z in self._zones)
+        self._total_sensors = sum(z['num_sensors'] for z in self._zones)
+
         # Initialize components
         self.analytics = None
         self.anomaly_detector = None
+
+        # Reports generated per data-file state, keyed by mtimes
+        self._report_cache = {}
         
         # Check if data exists
         self._check_data()
@@ -57,10 +83,17 @@ class SmartWaterManagementSystem:
     
     def _load_components(self):
         """Load analytics and anomaly detection components"""
-        self.analytics = WaterAnalytics(
-            self.pressure_data_path,
-            self.flow_data_path
-        )
+        if self.backend == 'polars':
+            from utils.polars_backend import PolarsWaterAnalytics
+            self.analytics = PolarsWaterAnalytics(
+                self.pressure_data_path,
+                self.flow_data_path
+            )
+        else:
+            self.analytics = WaterAnalytics(
+                self.pressure_data_path,
+                self.flow_data_path
+            )
         self.anomaly_detector = AnomalyDetector(
             self.pressure_data_path,
             self.flow_data_path
@@ -68,49 +101,39 @@ class SmartWaterManagementSystem:
     
     def get_system_overview(self):
         """Get overall system overview"""
-        zones = self.zones_config['zones']
-        
-        overview = {
-            'total_zones': len(zones),
-            'total_population': sum(z['population'] for z in zones),
-            'total_sensors': sum(z['num_sensors'] for z in zones),
-            'zones': zones
+        return {
+            'total_zones': len(self._zones),
+            'total_population': self._total_population,
+            'total_sensors': self._total_sensors,
+            'zones': self._zones
         }
-        
-        return overview
     
     def get_zone_health_status(self):
         """Get health status for all zones"""
         stats = self.analytics.get_zone_statistics()
         low_pressure_zones = self.analytics.get_low_pressure_zones()
-        
-        # Merge data
-        health_status = []
-        for _, zone in stats.iterrows():
-            zone_name = zone['zone_name']
-            
-            # Check if zone has low pressure issues
-            low_pressure_info = low_pressure_zones[
-                low_pressure_zones['zone_name'] == zone_name
-            ]
-            
-            if len(low_pressure_info) > 0:
-                status = 'critical' if low_pressure_info['low_pressure_count'].iloc[0] > 100 else 'warning'
-            elif zone['avg_pressure'] < 35:
-                status = 'warning'
-            elif zone['avg_pressure'] < 40:
-                status = 'attention'
-            else:
-                status = 'healthy'
-            
-            health_status.append({
-                'zone_name': zone_name,
-                'avg_pressure': zone['avg_pressure'],
-                'status': status,
-                'num_sensors': zone['num_sensors']
-            })
-        
-        return pd.DataFrame(health_status)
+
+        # Merge low pressure counts into zone statistics
+        merged = stats.merge(
+            low_pressure_zones[['zone_name', 'low_pressure_count']],
+            on='zone_name', how='left'
+        )
+
+        # Derive status for all zones in one vectorized pass
+        low_pressure_count = merged['low_pressure_count'].fillna(0).to_numpy()
+        avg_pressure = merged['avg_pressure'].to_numpy()
+
+        merged['status'] = np.select(
+            [
+                low_pressure_count > 100,
+                (low_pressure_count > 0) | (avg_pressure < 35),
+                avg_pressure < 40
+            ],
+            ['critical', 'warning', 'attention'],
+            default='healthy'
+        )
+
+        return merged[['zone_name', 'avg_pressure', 'status', 'num_sensors']]
     
     def detect_all_anomalies(self):
         """Detect all types of anomalies"""
@@ -127,83 +150,116 @@ class SmartWaterManagementSystem:
     
     def get_recommendations(self):
         """Generate recommendations based on analysis"""
-        recommendations = []
-        
+        return self._build_recommendations(
+            self.analytics.get_low_pressure_zones(),
+            self.anomaly_detector.detect_leaks(),
+            self.anomaly_detector.detect_burst_events()
+        )
+
+    def _build_recommendations(self, low_pressure, leaks, bursts):
+        """Build the recommendations frame from pre-computed analysis results"""
+        columns = ['priority', 'zone', 'issue', 'recommendation', 'impact']
+        pieces = []
+
         # Check for low pressure zones
-        low_pressure = self.analytics.get_low_pressure_zones()
-        for _, zone in low_pressure.iterrows():
-            if zone['low_pressure_count'] > 50:
-                recommendations.append({
-                    'priority': 'high',
-                    'zone': zone['zone_name'],
-                    'issue': 'Frequent low pressure',
-                    'recommendation': 'Install booster pumps or check for leaks',
-                    'impact': f"{zone['low_pressure_count']} low pressure events detected"
-                })
-        
+        frequent = low_pressure[low_pressure['low_pressure_count'] > 50]
+        if len(frequent) > 0:
+            pieces.append(frequent.assign(
+                priority='high',
+                issue='Frequent low pressure',
+                recommendation='Install booster pumps or check for leaks',
+                impact=frequent['low_pressure_count'].map(
+                    '{} low pressure events detected'.format
+                )
+            ).rename(columns={'zone_name': 'zone'}))
+
         # Check for potential leaks
-        leaks = self.anomaly_detector.detect_leaks()
-        for _, leak in leaks.iterrows():
-            recommendations.append({
-                'priority': leak['severity'],
-                'zone': leak['zone_name'],
-                'issue': 'Potential water leak',
-                'recommendation': leak['recommended_action'],
-                'impact': f"Estimated loss: {leak['estimated_daily_loss_liters']:,.0f} liters/day"
-            })
-        
+        if len(leaks) > 0:
+            pieces.append(leaks.assign(
+                priority=leaks['severity'],
+                issue='Potential water leak',
+                recommendation=leaks['recommended_action'],
+                impact=leaks['estimated_daily_loss_liters'].map(
+                    'Estimated loss: {:,.0f} liters/day'.format
+                )
+            ).rename(columns={'zone_name': 'zone'}))
+
         # Check for burst events
-        bursts = self.anomaly_detector.detect_burst_events()
-        for _, burst in bursts.iterrows():
-            recommendations.append({
-                'priority': 'critical',
-                'zone': burst['zone_name'],
-                'issue': 'Potential pipe burst',
-                'recommendation': burst['recommended_action'],
-                'impact': f"Pressure drop: {burst['pressure_drop']} PSI"
-            })
-        
-        return pd.DataFrame(recommendations) if recommendations else pd.DataFrame()
+        if len(bursts) > 0:
+            pieces.append(bursts.assign(
+                priority='critical',
+                issue='Potential pipe burst',
+                recommendation=bursts['recommended_action'],
+                impact=bursts['pressure_drop'].map('Pressure drop: {} PSI'.format)
+            ).rename(columns={'zone_name': 'zone'}))
+
+        if not pieces:
+            return pd.DataFrame()
+
+        return pd.concat(pieces, ignore_index=True)[columns]
     
     def get_performance_metrics(self):
         """Calculate system performance metrics"""
-        stats = self.analytics.get_zone_statistics()
-        flow_stats = self.analytics.get_flow_statistics()
-        water_loss = self.analytics.calculate_water_loss()
-        
+        summary = self.analytics.get_combined_zone_summary()
+
+        total_flow = summary['total_flow'].sum()
+        total_loss = summary['estimated_daily_loss_liters'].sum()
+        loss_percent = (total_loss / total_flow) * 100
+
         metrics = {
-            'avg_system_pressure': round(stats['avg_pressure'].mean(), 2),
-            'total_water_flow': round(flow_stats['total_flow'].sum(), 2),
-            'zones_with_issues': len(stats[stats['avg_pressure'] < 40]),
-            'estimated_water_loss_percent': round(
-                (water_loss['estimated_daily_loss_liters'].sum() / 
-                 flow_stats['total_flow'].sum()) * 100, 2
-            ),
-            'system_efficiency': round(
-                100 - (water_loss['estimated_daily_loss_liters'].sum() / 
-                       flow_stats['total_flow'].sum()) * 100, 2
-            )
+            'avg_system_pressure': round(summary['avg_pressure'].mean(), 2),
+            'total_water_flow': round(total_flow, 2),
+            'zones_with_issues': len(summary[summary['avg_pressure'] < 40]),
+            'estimated_water_loss_percent': round(loss_percent, 2),
+            'system_efficiency': round(100 - loss_percent, 2)
         }
-        
+
         return metrics
     
     def export_report(self, output_path='data/system_report.json'):
         """Export comprehensive system report"""
+        # Reuse the previous report when the underlying data is unchanged
+        cache_key = (
+            output_path,
+            os.path.getmtime(self.pressure_data_path),
+            os.path.getmtime(self.flow_data_path)
+        )
+        cached = self._report_cache.get(cache_key)
+        if cached is not None and os.path.exists(output_path):
+            print(f"✓ Data unchanged, reusing report at {output_path}")
+            return cached
+
+        # Run the anomaly pipeline once and reuse it for both the summary
+        # and the recommendations
+        anomalies = self.detect_all_anomalies()
+        recommendations = self._build_recommendations(
+            self.analytics.get_low_pressure_zones(),
+            anomalies['leaks'],
+            anomalies['bursts']
+        )
+
         report = {
             'generated_at': datetime.now().isoformat(),
             'overview': self.get_system_overview(),
             'performance_metrics': self.get_performance_metrics(),
             'zone_health': self.get_zone_health_status().to_dict('records'),
             'anomalies': {
-                'summary': self.anomaly_detector.get_anomaly_summary()[0]
+                'summary': anomalies['summary']
             },
-            'recommendations': self.get_recommendations().to_dict('records')
+            'recommendations': recommendations.to_dict('records')
         }
         
-        with open(output_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
-        
+        # orjson serializes numpy scalars natively; default=str only fires
+        # for the occasional Timestamp
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(
+                report,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                default=str
+            ))
+
         print(f"✓ Report exported to {output_path}")
+        self._report_cache[cache_key] = report
         return report
 
 
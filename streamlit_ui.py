@@ -8,7 +8,9 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+import functools
 import json
+import orjson
 import os
 import sys
 
@@ -18,6 +20,7 @@ sys.path.append(os.path.dirname(__file__))
 from main import SmartWaterManagementSystem
 from utils.analytics import WaterAnalytics
 from utils.anomaly_detection import AnomalyDetector
+from utils._data_cache import load_data
 
 
 # Page configuration
@@ -28,8 +31,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS, injected once per script run at the top of main()
+_CUSTOM_CSS = """
     <style>
     .main-header {
         font-size: 2.5rem;
@@ -46,20 +49,16 @@ st.markdown("""
         border-radius: 10px;
         border-left: 5px solid #1f77b4;
     }
-    .status-healthy {
-        color: #28a745;
-        font-weight: bold;
-    }
-    .status-warning {
-        color: #ffc107;
-        font-weight: bold;
-    }
-    .status-critical {
-        color: #dc3545;
-        font-weight: bold;
-    }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# Inline styles for the zone status table
+_STATUS_STYLES = {
+    'healthy': 'color: #28a745; font-weight: bold',
+    'attention': 'color: #17a2b8; font-weight: bold',
+    'warning': 'color: #ffc107; font-weight: bold',
+    'critical': 'color: #dc3545; font-weight: bold'
+}
 
 
 @st.cache_resource
@@ -68,34 +67,82 @@ def load_system():
     return SmartWaterManagementSystem()
 
 
-@st.cache_data
-def load_pressure_data():
-    """Load pressure data"""
-    df = pd.read_csv('data/pressure_data.csv')
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    return df
+@st.cache_data(ttl=None)
+def load_pressure_data(csv_mtime=None):
+    """Load pressure data (csv_mtime keys the cache to the file on disk)
+
+    Goes through utils._data_cache so the dashboard and the analysis
+    classes share one sidecar writer and one typing policy (categorical
+    identifiers, float32 readings, time-sorted).
+    """
+    return load_data('data/pressure_data.csv')
+
+
+@st.cache_data(ttl=None)
+def load_flow_data(csv_mtime=None):
+    """Load flow data (csv_mtime keys the cache to the file on disk)"""
+    return load_data('data/flow_data.csv')
+
+
+@st.cache_data(show_spinner=False)
+def _by_zone(df, key='zone_name'):
+    """Split a frame into per-zone sub-frames once, so zone switching is O(1)"""
+    return {
+        zone: sub_df.reset_index(drop=True)
+        for zone, sub_df in df.groupby(key, observed=True, sort=False)
+    }
+
+
+@functools.lru_cache(maxsize=4)
+def _load_report(path, mtime):
+    """Parse a saved report once per on-disk version"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _data_mtimes():
+    """Cache key tying memoized analysis results to the data files on disk"""
+    return (os.path.getmtime('data/pressure_data.csv'),
+            os.path.getmtime('data/flow_data.csv'))
+
+
+@st.cache_data(show_spinner=False)
+def get_cached_anomalies(mtimes):
+    """Anomaly detection results, shared across page switches"""
+    return load_system().detect_all_anomalies()
 
 
-@st.cache_data
-def load_flow_data():
-    """Load flow data"""
-    df = pd.read_csv('data/flow_data.csv')
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    return df
+@st.cache_data(show_spinner=False)
+def get_cached_metrics(mtimes):
+    """Performance metrics, shared across page switches"""
+    return load_system().get_performance_metrics()
+
+
+@st.cache_data(show_spinner=False)
+def get_cached_health(mtimes):
+    """Zone health status, shared across page switches"""
+    return load_system().get_zone_health_status()
+
+
+@st.cache_data(show_spinner=False)
+def get_cached_recommendations(mtimes):
+    """Recommendations, shared across page switches"""
+    return load_system().get_recommendations()
 
 
 def main():
     """Main Streamlit application"""
-    
-    # Header
-    st.markdown('<div class="main-header">💧 Smart Water Pressure Management System<br>Solapur Municipal Corporation</div>', 
+
+    # Inject the stylesheet once, then render the header
+    st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
+    st.markdown('<div class="main-header">💧 Smart Water Pressure Management System<br>Solapur Municipal Corporation</div>',
                 unsafe_allow_html=True)
     
     # Initialize system
     try:
         system = load_system()
-        pressure_df = load_pressure_data()
-        flow_df = load_flow_data()
+        pressure_df = load_pressure_data(os.path.getmtime('data/pressure_data.csv'))
+        flow_df = load_flow_data(os.path.getmtime('data/flow_data.csv'))
     except Exception as e:
         st.error(f"Error loading system: {e}")
         st.info("Please run the data generator first: `python utils/data_generator.py`")
@@ -136,7 +183,7 @@ def show_dashboard(system, pressure_df, flow_df):
     st.header("📊 System Dashboard")
     
     # Performance metrics
-    metrics = system.get_performance_metrics()
+    metrics = get_cached_metrics(_data_mtimes())
     overview = system.get_system_overview()
     
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -159,7 +206,7 @@ def show_dashboard(system, pressure_df, flow_df):
     
     with col1:
         st.subheader("🗺️ Zone Health Status")
-        health_df = system.get_zone_health_status()
+        health_df = get_cached_health(_data_mtimes())
         
         # Create color map
         color_map = {
@@ -184,25 +231,28 @@ def show_dashboard(system, pressure_df, flow_df):
     
     with col2:
         st.subheader("📋 Zone Status")
-        for _, row in health_df.iterrows():
-            status_class = f"status-{row['status']}"
-            st.markdown(
-                f"**{row['zone_name']}**  \n"
-                f"<span class='{status_class}'>{row['status'].upper()}</span>  \n"
-                f"Pressure: {row['avg_pressure']} PSI",
-                unsafe_allow_html=True
-            )
-            st.markdown("---")
+        # One styled dataframe instead of per-zone HTML markdown
+        st.dataframe(
+            health_df[['zone_name', 'status', 'avg_pressure']].style
+            .map(lambda v: _STATUS_STYLES.get(v, ''), subset=['status'])
+            .format({'avg_pressure': '{:.2f}'}),
+            use_container_width=True,
+            hide_index=True
+        )
     
     # Recent pressure trends
     st.subheader("📈 Recent Pressure Trends (Last 7 Days)")
-    recent_data = pressure_df[
-        pressure_df['timestamp'] >= (datetime.now() - timedelta(days=7))
-    ]
-    
-    # Aggregate by hour
-    recent_data['hour'] = recent_data['timestamp'].dt.floor('H')
-    hourly_avg = recent_data.groupby(['hour', 'zone_name'])['pressure_psi'].mean().reset_index()
+    cutoff = pd.Timestamp.now() - pd.Timedelta(days=7)
+    mask = pressure_df['timestamp'].to_numpy() >= cutoff.to_datetime64()
+
+    # Aggregate by hour without copying the filtered slice
+    hourly_avg = (
+        pressure_df.loc[mask]
+        .assign(hour=lambda d: d['timestamp'].dt.floor('h'))
+        .groupby(['hour', 'zone_name'], observed=True, sort=False)['pressure_psi']
+        .mean()
+        .reset_index()
+    )
     
     fig = px.line(
         hourly_avg,
@@ -216,7 +266,7 @@ def show_dashboard(system, pressure_df, flow_df):
     
     # Anomaly summary
     st.subheader("⚠️ Anomaly Summary")
-    anomalies = system.detect_all_anomalies()
+    anomalies = get_cached_anomalies(_data_mtimes())
     summary = anomalies['summary']
     
     col1, col2, col3, col4 = st.columns(4)
@@ -238,9 +288,9 @@ def show_zone_analysis(system, pressure_df, flow_df):
     zones = pressure_df['zone_name'].unique()
     selected_zone = st.selectbox("Select Zone", zones)
     
-    # Filter data for selected zone
-    zone_pressure = pressure_df[pressure_df['zone_name'] == selected_zone]
-    zone_flow = flow_df[flow_df['zone_name'] == selected_zone]
+    # Look up the pre-split frame for the selected zone
+    zone_pressure = _by_zone(pressure_df)[selected_zone]
+    zone_flow = _by_zone(flow_df)[selected_zone]
     
     # Zone statistics
     col1, col2, col3, col4 = st.columns(4)
@@ -272,8 +322,21 @@ def show_zone_analysis(system, pressure_df, flow_df):
     
     with col2:
         st.subheader("📈 Pressure Over Time")
-        # Sample data for better visualization
-        sampled = zone_pressure.sample(min(1000, len(zone_pressure)))
+        # Bin readings into ~1000 time buckets per sensor rather than
+        # plotting raw points; one aggregation pass, no RNG
+        span_seconds = (
+            zone_pressure['timestamp'].max() - zone_pressure['timestamp'].min()
+        ).total_seconds()
+        bin_size = pd.Timedelta(seconds=max(60, span_seconds // 1000))
+        sampled = (
+            zone_pressure
+            .groupby(
+                ['sensor_id', zone_pressure['timestamp'].dt.floor(bin_size)],
+                observed=True
+            )['pressure_psi']
+            .mean()
+            .reset_index()
+        )
         fig = px.scatter(
             sampled,
             x='timestamp',
@@ -287,7 +350,7 @@ def show_zone_analysis(system, pressure_df, flow_df):
     # Hourly patterns
     st.subheader("🕐 Daily Pressure Patterns")
     zone_pressure['hour'] = zone_pressure['timestamp'].dt.hour
-    hourly_avg = zone_pressure.groupby('hour')['pressure_psi'].mean().reset_index()
+    hourly_avg = zone_pressure.groupby('hour', observed=True)['pressure_psi'].mean().reset_index()
     
     fig = go.Figure()
     fig.add_trace(go.Scatter(
@@ -306,7 +369,7 @@ def show_zone_analysis(system, pressure_df, flow_df):
     
     # Sensor comparison
     st.subheader("🔍 Sensor Comparison")
-    sensor_stats = zone_pressure.groupby('sensor_id')['pressure_psi'].agg(['mean', 'min', 'max']).reset_index()
+    sensor_stats = zone_pressure.groupby('sensor_id', observed=True)['pressure_psi'].agg(['mean', 'min', 'max']).reset_index()
     sensor_stats.columns = ['Sensor ID', 'Avg Pressure', 'Min Pressure', 'Max Pressure']
     st.dataframe(sensor_stats, use_container_width=True)
 
@@ -314,8 +377,8 @@ def show_zone_analysis(system, pressure_df, flow_df):
 def show_anomaly_detection(system):
     """Show anomaly detection results"""
     st.header("🚨 Anomaly Detection")
-    
-    anomalies = system.detect_all_anomalies()
+
+    anomalies = get_cached_anomalies(_data_mtimes())
     
     # Tabs for different anomaly types
     tab1, tab2, tab3, tab4 = st.tabs(["Pressure Anomalies", "Flow Anomalies", "Leak Detection", "Burst Events"])
@@ -497,8 +560,8 @@ def show_flow_analysis(system, flow_df):
 def show_recommendations(system):
     """Show recommendations"""
     st.header("💡 Recommendations")
-    
-    recommendations = system.get_recommendations()
+
+    recommendations = get_cached_recommendations(_data_mtimes())
     
     if len(recommendations) > 0:
         # Priority filter
@@ -544,7 +607,11 @@ def show_reports(system):
             st.json(report['performance_metrics'])
             
             # Download button
-            report_json = json.dumps(report, indent=2, default=str)
+            report_json = orjson.dumps(
+                report,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                default=str
+            )
             st.download_button(
                 label="📥 Download Report (JSON)",
                 data=report_json,
@@ -556,8 +623,7 @@ def show_reports(system):
     report_path = 'data/system_report.json'
     if os.path.exists(report_path):
         st.subheader("Latest Report")
-        with open(report_path, 'r') as f:
-            report = json.load(f)
+        report = _load_report(report_path, os.path.getmtime(report_path))
         
         st.markdown(f"**Generated at:** {report['generated_at']}")
         
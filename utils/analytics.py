@@ -7,151 +7,209 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+try:
+    from utils._data_cache import load_data
+except ImportError:  # running this file directly from utils/
+    from _data_cache import load_data
+
+
+# Pressure histogram bins shared by the distribution views
+_PRESSURE_BIN_EDGES = np.array([0, 30, 40, 50, 60, 100], dtype='float32')
+_PRESSURE_BIN_LABELS = ['Very Low (<30)', 'Low (30-40)', 'Normal (40-50)',
+                        'Good (50-60)', 'High (>60)']
+
+
+def _round2(df):
+    """Round float columns to 2 dp in float64
+
+    Aggregates inherit float32 from the readings; promoting before the
+    round keeps representation noise out of displayed values.
+    """
+    floats = df.select_dtypes(include='floating').columns
+    df[floats] = df[floats].astype('float64').round(2)
+    return df
+
 
 class WaterAnalytics:
     """Analytics for water pressure and flow data"""
-    
-    def __init__(self, pressure_data_path='data/pressure_data.csv', 
+
+    def __init__(self, pressure_data_path='data/pressure_data.csv',
                  flow_data_path='data/flow_data.csv'):
-        """Initialize with data paths"""
-        self.pressure_df = pd.read_csv(pressure_data_path)
-        self.pressure_df['timestamp'] = pd.to_datetime(self.pressure_df['timestamp'])
-        
-        self.flow_df = pd.read_csv(flow_data_path)
-        self.flow_df['timestamp'] = pd.to_datetime(self.flow_df['timestamp'])
+        """Initialize with data paths (frames shared via the data cache)"""
+        self.pressure_df = load_data(pressure_data_path, columns=[
+            'timestamp', 'zone_id', 'zone_name', 'sensor_id',
+            'pressure_psi', 'elevation', 'hour', 'date'
+        ])
+        self.flow_df = load_data(flow_data_path)
+
+        # Sorted by the loader; recent-window queries binary-search this
+        self._pressure_ts = self.pressure_df['timestamp'].to_numpy()
+
+    def _recent_pressure(self, days):
+        """Slice the last `days` days of pressure readings via searchsorted"""
+        cutoff = np.datetime64(datetime.now() - timedelta(days=days))
+        start = np.searchsorted(self._pressure_ts, cutoff)
+        return self.pressure_df.iloc[start:]
     
     def get_zone_statistics(self):
         """Calculate statistics for each zone"""
-        stats = self.pressure_df.groupby('zone_name').agg({
+        stats = self.pressure_df.groupby('zone_name', observed=True).agg({
             'pressure_psi': ['mean', 'min', 'max', 'std'],
             'sensor_id': 'nunique'
-        }).round(2)
-        
-        stats.columns = ['avg_pressure', 'min_pressure', 'max_pressure', 
+        })
+
+        stats.columns = ['avg_pressure', 'min_pressure', 'max_pressure',
                         'std_pressure', 'num_sensors']
         stats = stats.reset_index()
-        
-        return stats
+
+        return _round2(stats)
     
     def get_hourly_patterns(self):
         """Analyze hourly consumption patterns"""
-        self.pressure_df['hour'] = self.pressure_df['timestamp'].dt.hour
-        
-        hourly = self.pressure_df.groupby('hour').agg({
+        hourly = self.pressure_df.groupby('hour', observed=True).agg({
             'pressure_psi': 'mean'
-        }).round(2).reset_index()
-        
-        return hourly
+        }).reset_index()
+
+        return _round2(hourly)
     
     def get_zone_comparison(self):
         """Compare zones by average pressure"""
-        comparison = self.pressure_df.groupby('zone_name').agg({
+        comparison = self.pressure_df.groupby('zone_name', observed=True).agg({
             'pressure_psi': 'mean',
             'elevation': 'first'
-        }).round(2).reset_index()
-        
+        }).reset_index()
+
         comparison = comparison.sort_values('pressure_psi', ascending=False)
-        return comparison
+        return _round2(comparison)
     
     def get_low_pressure_zones(self, threshold=35):
         """Identify zones with low pressure issues"""
-        recent_data = self.pressure_df[
-            self.pressure_df['timestamp'] >= 
-            (datetime.now() - timedelta(days=7))
-        ]
-        
+        recent_data = self._recent_pressure(days=7)
+
         low_pressure = recent_data[recent_data['pressure_psi'] < threshold]
         
-        summary = low_pressure.groupby('zone_name').agg({
+        summary = low_pressure.groupby('zone_name', observed=True).agg({
             'pressure_psi': ['count', 'mean'],
             'zone_id': 'first'
-        }).round(2)
-        
+        })
+
         summary.columns = ['low_pressure_count', 'avg_low_pressure', 'zone_id']
         summary = summary.reset_index()
         summary = summary.sort_values('low_pressure_count', ascending=False)
-        
-        return summary
+
+        return _round2(summary)
     
     def get_flow_statistics(self):
         """Calculate flow statistics by zone"""
-        flow_stats = self.flow_df.groupby('zone_name').agg({
+        flow_stats = self.flow_df.groupby('zone_name', observed=True).agg({
             'flow_rate_lpm': ['mean', 'min', 'max', 'sum'],
             'population': 'first'
-        }).round(2)
-        
-        flow_stats.columns = ['avg_flow', 'min_flow', 'max_flow', 
+        })
+
+        flow_stats.columns = ['avg_flow', 'min_flow', 'max_flow',
                              'total_flow', 'population']
         flow_stats = flow_stats.reset_index()
-        
-        # Calculate per capita consumption
-        flow_stats['per_capita_flow'] = (
-            flow_stats['avg_flow'] / flow_stats['population'] * 1000
-        ).round(4)
-        
+
+        # Per capita consumption from the full-precision mean; raw NumPy
+        # division (no index alignment), guarded against zero population
+        avg_flow = flow_stats['avg_flow'].to_numpy(dtype=np.float64)
+        population = flow_stats['population'].to_numpy(dtype=np.float64)
+        per_capita = np.divide(
+            avg_flow * 1000.0, population,
+            out=np.zeros(len(flow_stats)), where=population > 0
+        )
+
+        flow_stats = _round2(flow_stats)
+        flow_stats['per_capita_flow'] = np.round(per_capita, 4)
+
         return flow_stats
     
+    def get_combined_zone_summary(self):
+        """Per-zone pressure, flow and water-loss summary in a single pass"""
+        # Accumulate in float64; multi-million-liter sums lose precision
+        # when accumulated in float32
+        flow = self.flow_df['flow_rate_lpm'].astype('float64')
+
+        avg_pressure = self.pressure_df.groupby(
+            'zone_name', observed=True
+        )['pressure_psi'].mean().astype('float64')
+
+        flow_agg = flow.groupby(
+            self.flow_df['zone_name'], observed=True
+        ).agg(['mean', 'sum'])
+        flow_agg.columns = ['avg_flow', 'total_flow']
+
+        # Night flow (0-5 AM) drives the water-loss estimate
+        night = (self.flow_df['hour'] >= 0) & (self.flow_df['hour'] <= 5)
+        night_flow = flow[night].groupby(
+            self.flow_df.loc[night, 'zone_name'], observed=True
+        ).mean()
+
+        summary = pd.concat(
+            [avg_pressure.rename('avg_pressure'), flow_agg,
+             night_flow.rename('night_flow_lpm')],
+            axis=1
+        )
+        summary['estimated_daily_loss_liters'] = (
+            summary['night_flow_lpm'] * 60 * 24 * 0.3
+        )
+
+        return summary.reset_index()
+
     def get_peak_demand_times(self):
         """Identify peak demand times"""
-        self.flow_df['hour'] = self.flow_df['timestamp'].dt.hour
-        
-        hourly_flow = self.flow_df.groupby('hour').agg({
+        hourly_flow = self.flow_df.groupby('hour', observed=True).agg({
             'flow_rate_lpm': 'mean'
-        }).round(2).reset_index()
-        
+        }).reset_index()
+
         hourly_flow = hourly_flow.sort_values('flow_rate_lpm', ascending=False)
-        return hourly_flow
+        return _round2(hourly_flow)
     
     def get_recent_trends(self, days=7):
         """Get recent pressure trends"""
-        recent_data = self.pressure_df[
-            self.pressure_df['timestamp'] >= 
-            (datetime.now() - timedelta(days=days))
-        ]
-        
-        recent_data['date'] = recent_data['timestamp'].dt.date
-        
-        trends = recent_data.groupby(['date', 'zone_name']).agg({
+        recent_data = self._recent_pressure(days)
+
+        trends = recent_data.groupby(['date', 'zone_name'], observed=True).agg({
             'pressure_psi': 'mean'
-        }).round(2).reset_index()
-        
-        return trends
+        }).reset_index()
+
+        return _round2(trends)
     
     def calculate_water_loss(self):
         """Estimate water loss based on flow anomalies"""
-        # Calculate expected vs actual flow
-        self.flow_df['hour'] = self.flow_df['timestamp'].dt.hour
-        
         # Expected flow during night hours (0-5 AM) should be low
         night_flow = self.flow_df[
             (self.flow_df['hour'] >= 0) & (self.flow_df['hour'] <= 5)
         ]
         
-        loss_estimate = night_flow.groupby('zone_name').agg({
+        loss_estimate = night_flow.groupby('zone_name', observed=True).agg({
             'flow_rate_lpm': 'mean'
-        }).round(2).reset_index()
-        
+        }).reset_index()
+
         loss_estimate.columns = ['zone_name', 'night_flow_lpm']
-        
-        # High night flow indicates potential leakage
-        loss_estimate['potential_leak'] = loss_estimate['night_flow_lpm'] > 200
+
+        # High night flow indicates potential leakage; derive from the
+        # full-precision mean and round once at the return boundary
+        night_flow_lpm = loss_estimate['night_flow_lpm'].astype('float64')
+        loss_estimate['potential_leak'] = night_flow_lpm > 200
         loss_estimate['estimated_daily_loss_liters'] = (
-            loss_estimate['night_flow_lpm'] * 60 * 24 * 0.3
+            night_flow_lpm * 60 * 24 * 0.3
         ).round(0)
-        
-        return loss_estimate
+
+        return _round2(loss_estimate)
     
     def get_pressure_distribution(self):
         """Get pressure distribution across all zones"""
-        distribution = self.pressure_df.groupby(
-            pd.cut(self.pressure_df['pressure_psi'], 
-                   bins=[0, 30, 40, 50, 60, 100],
-                   labels=['Very Low (<30)', 'Low (30-40)', 
-                          'Normal (40-50)', 'Good (50-60)', 'High (>60)'])
-        ).size().reset_index()
-        
-        distribution.columns = ['pressure_range', 'count']
-        return distribution
+        pressure = self.pressure_df['pressure_psi'].to_numpy()
+
+        # Single histogram pass; left-closed bins put a reading of
+        # exactly 30 in 'Low (30-40)', matching the labels
+        counts, _ = np.histogram(pressure, bins=_PRESSURE_BIN_EDGES)
+
+        return pd.DataFrame({
+            'pressure_range': _PRESSURE_BIN_LABELS,
+            'count': counts
+        })
 
 
 if __name__ == '__main__':
@@ -8,18 +8,128 @@ import numpy as np
 from datetime import datetime, timedelta
 from scipy import stats
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from utils._data_cache import load_data
+except ImportError:  # running this file directly from utils/
+    from _data_cache import load_data
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _zscore_scan(values, mu, sigma, threshold):
+        """Fused z-score + threshold mask, parallel across all cores
+
+        Rows with sigma <= 0 score 0 and never pass the threshold,
+        matching the numpy fallback's valid-mask behaviour.
+        """
+        n = values.size
+        z = np.empty(n, np.float64)
+        mask = np.empty(n, np.bool_)
+        for i in prange(n):
+            s = sigma[i]
+            zi = abs((values[i] - mu[i]) / s) if s > 0 else 0.0
+            z[i] = zi
+            mask[i] = zi > threshold
+        return z, mask
+
+    @njit(cache=True)
+    def _burst_scan(pressure, starts, ends, drop_threshold):
+        """Scan each sensor's contiguous pressure block for sudden drops
+
+        Args:
+            pressure: Pressure readings sorted by (sensor, timestamp)
+            starts/ends: Start/end offsets of each sensor's block
+            drop_threshold: Minimum drop (PSI) to flag as a burst
+
+        Returns:
+            (row indices of flagged readings, pressure change at each)
+        """
+        hits = np.empty(pressure.size, np.int64)
+        drops = np.empty(pressure.size, np.float64)
+        count = 0
+        for block in range(starts.size):
+            for i in range(starts[block] + 1, ends[block]):
+                change = pressure[i] - pressure[i - 1]
+                if change < -drop_threshold:
+                    hits[count] = i
+                    drops[count] = change
+                    count += 1
+        return hits[:count], drops[:count]
+
+
+# Severity ladder: z > 4 critical, > 3 high, > 2.5 moderate, else low.
+# side='left' makes the edges strict, matching the old per-row branches
+_SEVERITY_EDGES = np.array([2.5, 3.0, 4.0])
+_SEVERITY_LABELS = np.array(['low', 'moderate', 'high', 'critical'])
+
+
+def _classify_severity(z_score):
+    """Classify anomaly severity for an array of z-scores"""
+    codes = np.searchsorted(_SEVERITY_EDGES, z_score, side='left')
+    return _SEVERITY_LABELS[codes]
+
+
+def _identify_cause(actual_flow, expected_flow, hour):
+    """Identify potential causes for an array of flow anomalies"""
+    excessive = actual_flow > expected_flow * 1.5
+    return np.select(
+        [excessive & (hour <= 5), excessive],
+        ['Potential leak (high night flow)',
+         'Unusual high demand or unauthorized usage'],
+        default='Supply interruption or valve issue'
+    )
+
 
 class AnomalyDetector:
     """Detect anomalies in water pressure and flow data"""
     
     def __init__(self, pressure_data_path='data/pressure_data.csv',
                  flow_data_path='data/flow_data.csv'):
-        """Initialize with data paths"""
-        self.pressure_df = pd.read_csv(pressure_data_path)
-        self.pressure_df['timestamp'] = pd.to_datetime(self.pressure_df['timestamp'])
-        
-        self.flow_df = pd.read_csv(flow_data_path)
-        self.flow_df['timestamp'] = pd.to_datetime(self.flow_df['timestamp'])
+        """Initialize with data paths (frames shared via the data cache)"""
+        self.pressure_df = load_data(pressure_data_path, columns=[
+            'timestamp', 'zone_id', 'zone_name', 'sensor_id', 'pressure_psi'
+        ])
+        self.flow_df = load_data(flow_data_path)
+
+        # Scan results shared across detectors, computed lazily once
+        self._flow_hour_stats = None
+        self._pressure_by_sensor = None
+
+    def _get_flow_hour_stats(self):
+        """Per-(zone, hour) flow moments from one bincount scan
+
+        Shared between flow-anomaly scoring (mean/std per group) and leak
+        detection (night-hour sums per zone), so the flow column is read
+        from DRAM once for both.
+        """
+        if self._flow_hour_stats is None:
+            flow = self.flow_df['flow_rate_lpm'].to_numpy(dtype=np.float64)
+            zone_codes = self.flow_df['zone_id'].cat.codes.to_numpy()
+            hour = self.flow_df['hour'].to_numpy()
+            n_zones = self.flow_df['zone_id'].cat.categories.size
+
+            codes = zone_codes.astype(np.int64) * 24 + hour
+            size = n_zones * 24
+            n = np.bincount(codes, minlength=size)
+            s1 = np.bincount(codes, weights=flow, minlength=size)
+            s2 = np.bincount(codes, weights=flow * flow, minlength=size)
+
+            self._flow_hour_stats = (codes, n, s1, s2)
+        return self._flow_hour_stats
+
+    def _get_pressure_by_sensor(self):
+        """Pressure frame sorted by (sensor, time), cached across calls"""
+        if self._pressure_by_sensor is None:
+            self._pressure_by_sensor = self.pressure_df.sort_values(
+                ['sensor_id', 'timestamp']
+            ).reset_index(drop=True)
+        return self._pressure_by_sensor
     
     def detect_pressure_anomalies(self, threshold_std=2.5):
         """
@@ -31,37 +141,47 @@ class AnomalyDetector:
         Returns:
             DataFrame with detected anomalies
         """
-        anomalies = []
-        
-        for zone_id in self.pressure_df['zone_id'].unique():
-            zone_data = self.pressure_df[self.pressure_df['zone_id'] == zone_id].copy()
-            
-            # Calculate z-scores
-            mean_pressure = zone_data['pressure_psi'].mean()
-            std_pressure = zone_data['pressure_psi'].std()
-            
-            zone_data['z_score'] = np.abs(
-                (zone_data['pressure_psi'] - mean_pressure) / std_pressure
-            )
-            
-            # Identify anomalies
-            zone_anomalies = zone_data[zone_data['z_score'] > threshold_std]
-            
-            for _, row in zone_anomalies.iterrows():
-                anomalies.append({
-                    'timestamp': row['timestamp'],
-                    'zone_id': row['zone_id'],
-                    'zone_name': row['zone_name'],
-                    'sensor_id': row['sensor_id'],
-                    'pressure_psi': row['pressure_psi'],
-                    'expected_pressure': round(mean_pressure, 2),
-                    'deviation': round(row['pressure_psi'] - mean_pressure, 2),
-                    'z_score': round(row['z_score'], 2),
-                    'anomaly_type': 'pressure_drop' if row['pressure_psi'] < mean_pressure else 'pressure_spike',
-                    'severity': self._classify_severity(row['z_score'])
-                })
-        
-        return pd.DataFrame(anomalies)
+        df = self.pressure_df
+
+        # Score in float64 so the rounded output columns stay clean of
+        # float32 representation noise
+        pressure = df['pressure_psi'].to_numpy(dtype=np.float64)
+
+        # One scan per moment via bincount on the zone category codes;
+        # std² = (Σx² - n·mean²)/(n-1) replaces separate mean/std passes
+        codes = df['zone_id'].cat.codes.to_numpy()
+        n_zones = df['zone_id'].cat.categories.size
+        n = np.bincount(codes, minlength=n_zones)
+        s1 = np.bincount(codes, weights=pressure, minlength=n_zones)
+        s2 = np.bincount(codes, weights=pressure * pressure, minlength=n_zones)
+
+        zone_mu = s1 / n
+        zone_var = (s2 - n * zone_mu * zone_mu) / (n - 1)
+        mu = zone_mu[codes]
+        sigma = np.sqrt(zone_var)[codes]
+
+        if NUMBA_AVAILABLE:
+            z_score, mask = _zscore_scan(pressure, mu, sigma,
+                                         float(threshold_std))
+        else:
+            # One scratch buffer for the whole z-score expression instead
+            # of a fresh temporary per operation
+            z_score = np.subtract(pressure, mu)
+            np.divide(z_score, sigma, out=z_score)
+            np.abs(z_score, out=z_score)
+            mask = z_score > threshold_std
+
+        anomalies = df.loc[mask, ['timestamp', 'zone_id', 'zone_name',
+                                  'sensor_id', 'pressure_psi']].copy()
+        anomalies['expected_pressure'] = np.round(mu[mask], 2)
+        anomalies['deviation'] = np.round(pressure[mask] - mu[mask], 2)
+        anomalies['z_score'] = np.round(z_score[mask], 2)
+        anomalies['anomaly_type'] = np.where(
+            pressure[mask] < mu[mask], 'pressure_drop', 'pressure_spike'
+        )
+        anomalies['severity'] = _classify_severity(z_score[mask])
+
+        return anomalies.reset_index(drop=True)
     
     def detect_flow_anomalies(self, threshold_std=2.0):
         """
@@ -73,48 +193,51 @@ class AnomalyDetector:
         Returns:
             DataFrame with detected flow anomalies
         """
-        anomalies = []
-        
-        # Add hour for pattern analysis
-        self.flow_df['hour'] = self.flow_df['timestamp'].dt.hour
-        
-        for zone_id in self.flow_df['zone_id'].unique():
-            zone_data = self.flow_df[self.flow_df['zone_id'] == zone_id].copy()
-            
-            # Analyze by hour to account for daily patterns
-            for hour in range(24):
-                hour_data = zone_data[zone_data['hour'] == hour]
-                
-                if len(hour_data) < 5:
-                    continue
-                
-                mean_flow = hour_data['flow_rate_lpm'].mean()
-                std_flow = hour_data['flow_rate_lpm'].std()
-                
-                if std_flow == 0:
-                    continue
-                
-                hour_data['z_score'] = np.abs(
-                    (hour_data['flow_rate_lpm'] - mean_flow) / std_flow
-                )
-                
-                hour_anomalies = hour_data[hour_data['z_score'] > threshold_std]
-                
-                for _, row in hour_anomalies.iterrows():
-                    anomalies.append({
-                        'timestamp': row['timestamp'],
-                        'zone_id': row['zone_id'],
-                        'zone_name': row['zone_name'],
-                        'flow_rate_lpm': row['flow_rate_lpm'],
-                        'expected_flow': round(mean_flow, 2),
-                        'deviation': round(row['flow_rate_lpm'] - mean_flow, 2),
-                        'z_score': round(row['z_score'], 2),
-                        'anomaly_type': 'excessive_flow' if row['flow_rate_lpm'] > mean_flow else 'low_flow',
-                        'severity': self._classify_severity(row['z_score']),
-                        'potential_cause': self._identify_cause(row['flow_rate_lpm'], mean_flow, row['hour'])
-                    })
-        
-        return pd.DataFrame(anomalies)
+        df = self.flow_df
+        flow = df['flow_rate_lpm'].to_numpy(dtype=np.float64)
+        hour = df['hour'].to_numpy()
+
+        # Broadcast the shared per-(zone, hour) moments back to each row;
+        # std² = (Σx² - n·mean²)/(n-1), empty/singleton groups fall out
+        # through the valid mask below
+        codes, n, s1, s2 = self._get_flow_hour_stats()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            group_mu = s1 / n
+            group_var = (s2 - n * group_mu * group_mu) / (n - 1)
+        group_sigma = np.sqrt(np.maximum(group_var, 0))
+
+        mu = group_mu[codes]
+        sigma = group_sigma[codes]
+        count = n[codes]
+
+        # Groups that are too small or constant are not scored
+        valid = (count >= 5) & (sigma > 0)
+        if NUMBA_AVAILABLE:
+            z_score, z_mask = _zscore_scan(flow, mu, sigma,
+                                           float(threshold_std))
+            mask = valid & z_mask
+        else:
+            # One scratch buffer for the z-score expression; rows outside
+            # `valid` keep |flow - mu| but are masked out below
+            z_score = np.subtract(flow, mu)
+            np.abs(z_score, out=z_score)
+            np.divide(z_score, sigma, out=z_score, where=valid)
+            mask = valid & (z_score > threshold_std)
+
+        anomalies = df.loc[mask, ['timestamp', 'zone_id', 'zone_name',
+                                  'flow_rate_lpm']].copy()
+        anomalies['expected_flow'] = np.round(mu[mask], 2)
+        anomalies['deviation'] = np.round(flow[mask] - mu[mask], 2)
+        anomalies['z_score'] = np.round(z_score[mask], 2)
+        anomalies['anomaly_type'] = np.where(
+            flow[mask] > mu[mask], 'excessive_flow', 'low_flow'
+        )
+        anomalies['severity'] = _classify_severity(z_score[mask])
+        anomalies['potential_cause'] = _identify_cause(
+            flow[mask], mu[mask], hour[mask]
+        )
+
+        return anomalies.reset_index(drop=True)
     
     def detect_leaks(self, night_flow_threshold=300):
         """
@@ -126,38 +249,40 @@ class AnomalyDetector:
         Returns:
             DataFrame with potential leak locations
         """
-        # Filter night hours (0-5 AM)
-        self.flow_df['hour'] = self.flow_df['timestamp'].dt.hour
-        night_data = self.flow_df[
-            (self.flow_df['hour'] >= 0) & (self.flow_df['hour'] <= 5)
-        ]
-        
-        leaks = []
-        
-        for zone_id in night_data['zone_id'].unique():
-            zone_night = night_data[night_data['zone_id'] == zone_id]
-            avg_night_flow = zone_night['flow_rate_lpm'].mean()
-            
-            if avg_night_flow > night_flow_threshold:
-                # Potential leak detected
-                zone_name = zone_night['zone_name'].iloc[0]
-                population = zone_night['population'].iloc[0]
-                
-                # Estimate daily water loss
-                daily_loss = avg_night_flow * 60 * 24  # liters per day
-                
-                leaks.append({
-                    'zone_id': zone_id,
-                    'zone_name': zone_name,
-                    'avg_night_flow_lpm': round(avg_night_flow, 2),
-                    'estimated_daily_loss_liters': round(daily_loss, 0),
-                    'estimated_monthly_loss_liters': round(daily_loss * 30, 0),
-                    'severity': 'high' if avg_night_flow > 500 else 'moderate',
-                    'confidence': 'high' if avg_night_flow > 400 else 'medium',
-                    'recommended_action': 'Immediate inspection required' if avg_night_flow > 500 else 'Schedule inspection'
-                })
-        
-        return pd.DataFrame(leaks)
+        # Night-hour (0-5 AM) means per zone from the shared flow scan
+        _, n, s1, _ = self._get_flow_hour_stats()
+        zones = self.flow_df['zone_id'].cat.categories
+        night_n = n.reshape(len(zones), 24)[:, :6].sum(axis=1)
+        night_sum = s1.reshape(len(zones), 24)[:, :6].sum(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_night_flow = night_sum / night_n
+
+        leak_mask = avg_night_flow > night_flow_threshold
+        if not leak_mask.any():
+            return pd.DataFrame()
+
+        # Build the result column-wise from the flagged zones
+        zone_names = dict(
+            self.flow_df[['zone_id', 'zone_name']]
+            .drop_duplicates().itertuples(index=False)
+        )
+        flow = avg_night_flow[leak_mask]
+        daily_loss = flow * 60 * 24  # liters per day
+
+        return pd.DataFrame({
+            'zone_id': zones[leak_mask].to_numpy(),
+            'zone_name': [zone_names[z] for z in zones[leak_mask]],
+            'avg_night_flow_lpm': np.round(flow, 2),
+            'estimated_daily_loss_liters': np.round(daily_loss, 0),
+            'estimated_monthly_loss_liters': np.round(daily_loss * 30, 0),
+            'severity': np.where(flow > 500, 'high', 'moderate'),
+            'confidence': np.where(flow > 400, 'high', 'medium'),
+            'recommended_action': np.where(
+                flow > 500, 'Immediate inspection required',
+                'Schedule inspection'
+            )
+        })
     
     def detect_burst_events(self, pressure_drop_threshold=15):
         """
@@ -169,58 +294,44 @@ class AnomalyDetector:
         Returns:
             DataFrame with potential burst events
         """
-        bursts = []
-        
-        for sensor_id in self.pressure_df['sensor_id'].unique():
-            sensor_data = self.pressure_df[
-                self.pressure_df['sensor_id'] == sensor_id
-            ].sort_values('timestamp')
-            
-            # Calculate pressure changes
-            sensor_data['pressure_change'] = sensor_data['pressure_psi'].diff()
-            
-            # Detect sudden drops
-            sudden_drops = sensor_data[
-                sensor_data['pressure_change'] < -pressure_drop_threshold
-            ]
-            
-            for _, row in sudden_drops.iterrows():
-                bursts.append({
-                    'timestamp': row['timestamp'],
-                    'zone_id': row['zone_id'],
-                    'zone_name': row['zone_name'],
-                    'sensor_id': row['sensor_id'],
-                    'pressure_before': round(row['pressure_psi'] - row['pressure_change'], 2),
-                    'pressure_after': round(row['pressure_psi'], 2),
-                    'pressure_drop': round(abs(row['pressure_change']), 2),
-                    'severity': 'critical' if abs(row['pressure_change']) > 25 else 'high',
-                    'event_type': 'potential_burst',
-                    'recommended_action': 'Emergency response required'
-                })
-        
-        return pd.DataFrame(bursts)
-    
-    def _classify_severity(self, z_score):
-        """Classify anomaly severity based on z-score"""
-        if z_score > 4:
-            return 'critical'
-        elif z_score > 3:
-            return 'high'
-        elif z_score > 2.5:
-            return 'moderate'
-        else:
-            return 'low'
-    
-    def _identify_cause(self, actual_flow, expected_flow, hour):
-        """Identify potential cause of flow anomaly"""
-        if actual_flow > expected_flow * 1.5:
-            if 0 <= hour <= 5:
-                return 'Potential leak (high night flow)'
-            else:
-                return 'Unusual high demand or unauthorized usage'
+        df = self._get_pressure_by_sensor()
+
+        pressure = np.ascontiguousarray(
+            df['pressure_psi'].to_numpy(dtype=np.float64)
+        )
+
+        if NUMBA_AVAILABLE:
+            # Offsets of each sensor's contiguous block in the sorted frame
+            sensor_codes, _ = pd.factorize(df['sensor_id'])
+            boundaries = np.flatnonzero(np.diff(sensor_codes)) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [len(df)]))
+
+            idx, drops = _burst_scan(
+                pressure, starts, ends, float(pressure_drop_threshold)
+            )
         else:
-            return 'Supply interruption or valve issue'
-    
+            # Vectorized fallback: one grouped diff over the sorted frame
+            change = df.groupby(
+                'sensor_id', sort=False, observed=True
+            )['pressure_psi'].diff().to_numpy(dtype=np.float64)
+            idx = np.flatnonzero(change < -pressure_drop_threshold)
+            drops = change[idx]
+
+        hit = df.iloc[idx]
+        return pd.DataFrame({
+            'timestamp': hit['timestamp'].to_numpy(),
+            'zone_id': hit['zone_id'].to_numpy(),
+            'zone_name': hit['zone_name'].to_numpy(),
+            'sensor_id': hit['sensor_id'].to_numpy(),
+            'pressure_before': np.round(pressure[idx] - drops, 2),
+            'pressure_after': np.round(pressure[idx], 2),
+            'pressure_drop': np.round(np.abs(drops), 2),
+            'severity': np.where(np.abs(drops) > 25, 'critical', 'high'),
+            'event_type': 'potential_burst',
+            'recommended_action': 'Emergency response required'
+        })
+
     def get_anomaly_summary(self):
         """Get summary of all detected anomalies"""
         pressure_anomalies = self.detect_pressure_anomalies()
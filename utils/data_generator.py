@@ -13,11 +13,19 @@ import os
 class WaterDataGenerator:
     """Generate synthetic water pressure and flow data"""
     
-    def __init__(self, zones_config_path='data/zones_config.json'):
-        """Initialize with zones configuration"""
+    def __init__(self, zones_config_path='data/zones_config.json', seed=None):
+        """Initialize with zones configuration
+
+        Args:
+            zones_config_path: Path to the zones configuration file
+            seed: Optional seed for reproducible data sets
+        """
         with open(zones_config_path, 'r') as f:
             self.config = json.load(f)
         self.zones = self.config['zones']
+        # PCG64 generator shared by all generate_* methods; batched draws
+        # amortize the per-call overhead of the legacy np.random API
+        self.rng = np.random.default_rng(seed)
     
     def generate_pressure_data(self, days=30, interval_minutes=15):
         """
@@ -30,63 +38,64 @@ class WaterDataGenerator:
         Returns:
             DataFrame with pressure readings
         """
-        data = []
         start_date = datetime.now() - timedelta(days=days)
-        
+        timestamps = pd.date_range(
+            start=start_date,
+            periods=int(days * 24 * 60 / interval_minutes),
+            freq=f'{interval_minutes}min'
+        )
+        n_times = len(timestamps)
+        hours = timestamps.hour.to_numpy()
+
+        # Simulate daily patterns (peak hours: 6-9 AM, 6-9 PM)
+        demand_factor = np.where(
+            ((hours >= 6) & (hours <= 9)) | ((hours >= 18) & (hours <= 21)),
+            0.85,  # High demand = lower pressure
+            np.where(hours <= 5, 1.15, 1.0)  # Low demand = higher pressure
+        )
+
+        rng = self.rng
+        frames = []
+
         for zone in self.zones:
             zone_id = zone['zone_id']
-            zone_name = zone['zone_name']
             base_pressure = zone['base_pressure']
             elevation = zone['elevation']
             num_sensors = zone['num_sensors']
-            
-            # Generate timestamps
-            timestamps = pd.date_range(
-                start=start_date,
-                periods=int(days * 24 * 60 / interval_minutes),
-                freq=f'{interval_minutes}min'
+            size = n_times * num_sensors
+
+            # Base pressure with variations and noise, for all sensors at once
+            pressure = base_pressure * np.tile(demand_factor, num_sensors)
+            pressure = pressure + rng.normal(0, 2, size)
+
+            # Simulate occasional anomalies (leaks, bursts): 2% of readings
+            anomaly_mask = rng.random(size) < 0.02
+            pressure = np.where(
+                anomaly_mask, pressure * rng.uniform(0.5, 0.8, size), pressure
             )
-            
-            for sensor_id in range(1, num_sensors + 1):
-                for timestamp in timestamps:
-                    hour = timestamp.hour
-                    
-                    # Simulate daily patterns (peak hours: 6-9 AM, 6-9 PM)
-                    if 6 <= hour <= 9 or 18 <= hour <= 21:
-                        demand_factor = 0.85  # High demand = lower pressure
-                    elif 0 <= hour <= 5:
-                        demand_factor = 1.15  # Low demand = higher pressure
-                    else:
-                        demand_factor = 1.0
-                    
-                    # Base pressure with variations
-                    pressure = base_pressure * demand_factor
-                    
-                    # Add random noise
-                    pressure += np.random.normal(0, 2)
-                    
-                    # Simulate occasional anomalies (leaks, bursts)
-                    if np.random.random() < 0.02:  # 2% chance of anomaly
-                        pressure *= np.random.uniform(0.5, 0.8)  # Pressure drop
-                    
-                    # Elevation impact
-                    elevation_impact = -0.1 * (elevation - 100) / 10
-                    pressure += elevation_impact
-                    
-                    # Ensure pressure is positive
-                    pressure = max(pressure, 5.0)
-                    
-                    data.append({
-                        'timestamp': timestamp,
-                        'zone_id': zone_id,
-                        'zone_name': zone_name,
-                        'sensor_id': f'{zone_id}_S{sensor_id:02d}',
-                        'pressure_psi': round(pressure, 2),
-                        'elevation': elevation,
-                        'status': 'normal' if pressure > base_pressure * 0.7 else 'low'
-                    })
-        
-        return pd.DataFrame(data)
+
+            # Elevation impact; ensure pressure is positive
+            pressure += -0.1 * (elevation - 100) / 10
+            pressure = np.maximum(pressure, 5.0).round(2)
+
+            sensor_ids = np.repeat(
+                [f'{zone_id}_S{s:02d}' for s in range(1, num_sensors + 1)],
+                n_times
+            )
+
+            frames.append(pd.DataFrame({
+                'timestamp': np.tile(timestamps.to_numpy(), num_sensors),
+                'zone_id': zone_id,
+                'zone_name': zone['zone_name'],
+                'sensor_id': sensor_ids,
+                'pressure_psi': pressure,
+                'elevation': elevation,
+                'status': np.where(
+                    pressure > base_pressure * 0.7, 'normal', 'low'
+                )
+            }))
+
+        return pd.concat(frames, ignore_index=True)
     
     def generate_flow_data(self, days=30, interval_minutes=15):
         """
@@ -99,77 +108,80 @@ class WaterDataGenerator:
         Returns:
             DataFrame with flow readings
         """
-        data = []
         start_date = datetime.now() - timedelta(days=days)
-        
+        timestamps = pd.date_range(
+            start=start_date,
+            periods=int(days * 24 * 60 / interval_minutes),
+            freq=f'{interval_minutes}min'
+        )
+        n_times = len(timestamps)
+        hours = timestamps.hour.to_numpy()
+
+        # Daily consumption patterns
+        flow_factor = np.select(
+            [
+                (hours >= 6) & (hours <= 9),    # Morning peak
+                (hours >= 18) & (hours <= 21),  # Evening peak
+                hours <= 5                      # Night low
+            ],
+            [1.5, 1.4, 0.3],
+            default=0.8
+        )
+
+        rng = self.rng
+        frames = []
+
         for zone in self.zones:
-            zone_id = zone['zone_id']
-            zone_name = zone['zone_name']
             population = zone['population']
-            
+
             # Base flow rate (liters per minute) - proportional to population
             base_flow = population / 100  # Rough estimate
-            
-            timestamps = pd.date_range(
-                start=start_date,
-                periods=int(days * 24 * 60 / interval_minutes),
-                freq=f'{interval_minutes}min'
+
+            flow_rate = base_flow * flow_factor
+            flow_rate = flow_rate + rng.normal(0, base_flow * 0.1, n_times)
+
+            # Simulate leakage (constant unexpected flow): 1% of readings
+            leak_mask = rng.random(n_times) < 0.01
+            flow_rate = np.where(
+                leak_mask, flow_rate * rng.uniform(1.3, 1.8, n_times), flow_rate
             )
-            
-            for timestamp in timestamps:
-                hour = timestamp.hour
-                
-                # Daily consumption patterns
-                if 6 <= hour <= 9:
-                    flow_factor = 1.5  # Morning peak
-                elif 18 <= hour <= 21:
-                    flow_factor = 1.4  # Evening peak
-                elif 0 <= hour <= 5:
-                    flow_factor = 0.3  # Night low
-                else:
-                    flow_factor = 0.8
-                
-                flow_rate = base_flow * flow_factor
-                flow_rate += np.random.normal(0, base_flow * 0.1)
-                
-                # Simulate leakage (constant unexpected flow)
-                if np.random.random() < 0.01:  # 1% chance of leak
-                    flow_rate *= np.random.uniform(1.3, 1.8)
-                
-                flow_rate = max(flow_rate, 0)
-                
-                data.append({
-                    'timestamp': timestamp,
-                    'zone_id': zone_id,
-                    'zone_name': zone_name,
-                    'flow_rate_lpm': round(flow_rate, 2),
-                    'population': population
-                })
-        
-        return pd.DataFrame(data)
+
+            flow_rate = np.maximum(flow_rate, 0).round(2)
+
+            frames.append(pd.DataFrame({
+                'timestamp': timestamps.to_numpy(),
+                'zone_id': zone['zone_id'],
+                'zone_name': zone['zone_name'],
+                'flow_rate_lpm': flow_rate,
+                'population': population
+            }))
+
+        return pd.concat(frames, ignore_index=True)
     
     def generate_leak_events(self, num_events=20):
         """Generate synthetic leak event data"""
-        data = []
-        
-        for i in range(num_events):
-            zone = np.random.choice(self.zones)
-            event_date = datetime.now() - timedelta(days=np.random.randint(1, 30))
-            
-            severity = np.random.choice(['minor', 'moderate', 'severe'], p=[0.6, 0.3, 0.1])
-            
-            data.append({
-                'event_id': f'LEAK_{i+1:03d}',
-                'timestamp': event_date,
-                'zone_id': zone['zone_id'],
-                'zone_name': zone['zone_name'],
-                'severity': severity,
-                'estimated_loss_liters': np.random.randint(1000, 50000),
-                'status': np.random.choice(['detected', 'resolved'], p=[0.3, 0.7]),
-                'response_time_hours': round(np.random.uniform(0.5, 24), 2)
-            })
-        
-        return pd.DataFrame(data)
+        rng = self.rng
+
+        # One batched draw per attribute instead of per-event scalar calls
+        zone_idx = rng.integers(0, len(self.zones), num_events)
+        days_ago = rng.integers(1, 30, num_events)
+        severity = rng.choice(['minor', 'moderate', 'severe'],
+                              size=num_events, p=[0.6, 0.3, 0.1])
+        loss = rng.integers(1000, 50000, num_events)
+        status = rng.choice(['detected', 'resolved'],
+                            size=num_events, p=[0.3, 0.7])
+        response_time = rng.uniform(0.5, 24, num_events).round(2)
+
+        return pd.DataFrame({
+            'event_id': [f'LEAK_{i:03d}' for i in range(1, num_events + 1)],
+            'timestamp': datetime.now() - pd.to_timedelta(days_ago, unit='D'),
+            'zone_id': [self.zones[i]['zone_id'] for i in zone_idx],
+            'zone_name': [self.zones[i]['zone_name'] for i in zone_idx],
+            'severity': severity,
+            'estimated_loss_liters': loss,
+            'status': status,
+            'response_time_hours': response_time
+        })
     
     def save_all_data(self, output_dir='data'):
         """Generate and save all synthetic data"""
@@ -178,11 +190,21 @@ class WaterDataGenerator:
         print("Generating pressure data...")
         pressure_df = self.generate_pressure_data(days=30)
         pressure_df.to_csv(f'{output_dir}/pressure_data.csv', index=False)
+        # Time-sorted with day-scale row groups: readers filtering on a
+        # timestamp range can skip whole row groups via their statistics
+        pressure_df.sort_values('timestamp', ignore_index=True).to_parquet(
+            f'{output_dir}/pressure_data.parquet',
+            engine='pyarrow', compression='zstd', row_group_size=20000
+        )
         print(f"✓ Saved {len(pressure_df)} pressure records")
-        
+
         print("Generating flow data...")
         flow_df = self.generate_flow_data(days=30)
         flow_df.to_csv(f'{output_dir}/flow_data.csv', index=False)
+        flow_df.sort_values('timestamp', ignore_index=True).to_parquet(
+            f'{output_dir}/flow_data.parquet',
+            engine='pyarrow', compression='zstd', row_group_size=20000
+        )
         print(f"✓ Saved {len(flow_df)} flow records")
         
         print("Generating leak events...")
@@ -0,0 +1,151 @@
+"""
+Polars Backend Module
+Lazy-frame implementations of the heavy analytics queries
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import polars as pl
+
+
+class PolarsWaterAnalytics:
+    """Polars-backed analytics for water pressure and flow data
+
+    Drop-in replacement for the heavy WaterAnalytics queries: queries are
+    built as LazyFrames so the Polars optimizer can fuse projections and
+    predicates into a single multi-threaded scan, and results are converted
+    to pandas only at the boundary.
+    """
+
+    def __init__(self, pressure_data_path='data/pressure_data.csv',
+                 flow_data_path='data/flow_data.csv'):
+        """Initialize with data paths"""
+        self.pressure_lf = self._scan(pressure_data_path)
+        self.flow_lf = self._scan(flow_data_path)
+
+    @staticmethod
+    def _scan(csv_path):
+        """Lazily scan the Parquet sidecar if fresh, falling back to the CSV"""
+        parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+        if (os.path.exists(parquet_path) and
+                os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+            lf = pl.scan_parquet(parquet_path)
+        else:
+            lf = pl.scan_csv(csv_path, try_parse_dates=True)
+        # Parquet sidecars carry categorical zone_name while CSVs yield
+        # strings; normalize so joins across the two sources line up
+        return lf.with_columns(pl.col('zone_name').cast(pl.String))
+
+    def get_zone_statistics(self):
+        """Calculate statistics for each zone"""
+        stats = (
+            self.pressure_lf
+            .group_by('zone_name')
+            .agg(
+                pl.col('pressure_psi').mean().round(2).alias('avg_pressure'),
+                pl.col('pressure_psi').min().alias('min_pressure'),
+                pl.col('pressure_psi').max().alias('max_pressure'),
+                pl.col('pressure_psi').std().round(2).alias('std_pressure'),
+                pl.col('sensor_id').n_unique().alias('num_sensors')
+            )
+            .sort('zone_name')
+            .collect()
+        )
+        return stats.to_pandas()
+
+    def get_low_pressure_zones(self, threshold=35):
+        """Identify zones with low pressure issues"""
+        cutoff = datetime.now() - timedelta(days=7)
+        summary = (
+            self.pressure_lf
+            .filter(
+                (pl.col('timestamp') >= cutoff) &
+                (pl.col('pressure_psi') < threshold)
+            )
+            .group_by('zone_name')
+            .agg(
+                pl.len().alias('low_pressure_count'),
+                pl.col('pressure_psi').mean().round(2).alias('avg_low_pressure'),
+                pl.col('zone_id').first()
+            )
+            .sort('low_pressure_count', descending=True)
+            .collect()
+        )
+        return summary.to_pandas()
+
+    def get_flow_statistics(self):
+        """Calculate flow statistics by zone"""
+        flow_stats = (
+            self.flow_lf
+            .group_by('zone_name')
+            .agg(
+                pl.col('flow_rate_lpm').mean().round(2).alias('avg_flow'),
+                pl.col('flow_rate_lpm').min().alias('min_flow'),
+                pl.col('flow_rate_lpm').max().alias('max_flow'),
+                pl.col('flow_rate_lpm').sum().round(2).alias('total_flow'),
+                pl.col('population').first()
+            )
+            .with_columns(
+                (pl.col('avg_flow') / pl.col('population') * 1000)
+                .round(4).alias('per_capita_flow')
+            )
+            .sort('zone_name')
+            .collect()
+        )
+        return flow_stats.to_pandas()
+
+    def get_combined_zone_summary(self):
+        """Per-zone pressure, flow and water-loss summary in a single pass"""
+        pressure_agg = (
+            self.pressure_lf
+            .group_by('zone_name')
+            .agg(pl.col('pressure_psi').mean().alias('avg_pressure'))
+        )
+        flow_agg = (
+            self.flow_lf
+            .group_by('zone_name')
+            .agg(
+                pl.col('flow_rate_lpm').mean().alias('avg_flow'),
+                pl.col('flow_rate_lpm').sum().alias('total_flow'),
+                pl.col('flow_rate_lpm')
+                .filter(pl.col('timestamp').dt.hour() <= 5)
+                .mean().alias('night_flow_lpm')
+            )
+        )
+        summary = (
+            pressure_agg
+            .join(flow_agg, on='zone_name', how='left')
+            .with_columns(
+                (pl.col('night_flow_lpm') * 60 * 24 * 0.3)
+                .alias('estimated_daily_loss_liters')
+            )
+            .sort('zone_name')
+            .collect()
+        )
+        return summary.to_pandas()
+
+    def calculate_water_loss(self):
+        """Estimate water loss based on night-time flow"""
+        loss_estimate = (
+            self.flow_lf
+            .filter(pl.col('timestamp').dt.hour() <= 5)
+            .group_by('zone_name')
+            .agg(
+                pl.col('flow_rate_lpm').mean().round(2).alias('night_flow_lpm')
+            )
+            .with_columns(
+                (pl.col('night_flow_lpm') > 200).alias('potential_leak'),
+                (pl.col('night_flow_lpm') * 60 * 24 * 0.3)
+                .round(0).alias('estimated_daily_loss_liters')
+            )
+            .sort('zone_name')
+            .collect()
+        )
+        return loss_estimate.to_pandas()
+
+
+if __name__ == '__main__':
+    analytics = PolarsWaterAnalytics()
+    print("Zone Statistics (polars):")
+    print(analytics.get_zone_statistics())